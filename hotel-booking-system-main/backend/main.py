@@ -3,8 +3,9 @@ Hotel Room Booking Platform - Main FastAPI Application
 Clean Architecture Implementation with Separation of Concerns
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import uvicorn
 from typing import List, Optional
@@ -17,9 +18,9 @@ from services import HotelService, BookingService, SearchService
 from database import DatabaseManager
 
 # Global services
-hotel_service = HotelService()
-booking_service = BookingService()
 search_service = SearchService()
+hotel_service = HotelService(search_service=search_service)
+booking_service = BookingService()
 db_manager = DatabaseManager()
 
 @asynccontextmanager
@@ -27,13 +28,17 @@ async def lifespan(app: FastAPI):
     """Initialize application with sample data"""
     # Generate sample data for testing
     db_manager.generate_sample_data(1000)  # Generate 1000 hotels for testing
+    # The search indexes were built at import, before the sample data existed
+    search_service.rebuild_indexes()
     yield
 
 app = FastAPI(
     title="Hotel Room Booking Platform",
     description="Professional hotel booking system with clean architecture",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes large hotel/room lists several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend integration
@@ -45,6 +50,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _json_response(data) -> ORJSONResponse:
+    """Encode already-validated models directly, skipping response_model re-validation"""
+    if isinstance(data, list):
+        return ORJSONResponse(content=[item.model_dump(mode="json") for item in data])
+    return ORJSONResponse(content=data.model_dump(mode="json"))
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -52,18 +63,18 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now()}
 
 # Hotel endpoints
-@app.get("/api/hotels", response_model=List[Hotel])
-async def get_hotels(skip: int = 0, limit: int = 100):
+@app.get("/api/hotels", responses={200: {"model": List[Hotel]}})
+async def get_hotels(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1)):
     """Get all hotels with pagination"""
-    return hotel_service.get_hotels(skip=skip, limit=limit)
+    return _json_response(hotel_service.get_hotels(skip=skip, limit=limit))
 
-@app.get("/api/hotels/{hotel_id}", response_model=Hotel)
+@app.get("/api/hotels/{hotel_id}", responses={200: {"model": Hotel}})
 async def get_hotel(hotel_id: str):
     """Get specific hotel by ID"""
     hotel = hotel_service.get_hotel_by_id(hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    return hotel
+    return _json_response(hotel)
 
 @app.post("/api/hotels", response_model=Hotel)
 async def create_hotel(hotel: Hotel):
@@ -71,13 +82,13 @@ async def create_hotel(hotel: Hotel):
     return hotel_service.create_hotel(hotel)
 
 # Room endpoints
-@app.get("/api/hotels/{hotel_id}/rooms", response_model=List[Room])
+@app.get("/api/hotels/{hotel_id}/rooms", responses={200: {"model": List[Room]}})
 async def get_hotel_rooms(hotel_id: str):
     """Get all rooms for a specific hotel"""
     rooms = hotel_service.get_hotel_rooms(hotel_id)
     if not rooms:
         raise HTTPException(status_code=404, detail="Hotel not found or no rooms available")
-    return rooms
+    return _json_response(rooms)
 
 @app.get("/api/rooms/{room_id}", response_model=Room)
 async def get_room(room_id: str):
@@ -88,14 +99,14 @@ async def get_room(room_id: str):
     return room
 
 # Search endpoints
-@app.post("/api/search", response_model=List[Hotel])
+@app.post("/api/search", responses={200: {"model": List[Hotel]}})
 async def search_hotels(search_request: SearchRequest):
     """Search hotels by city and/or name with performance optimization"""
-    return search_service.search_hotels(
+    return _json_response(search_service.search_hotels(
         city=search_request.city,
         hotel_name=search_request.hotel_name,
         limit=search_request.limit
-    )
+    ))
 
 # Booking endpoints
 @app.post("/api/bookings", response_model=Booking)
@@ -110,9 +121,9 @@ async def create_booking(booking_request: BookingRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/api/bookings", response_model=List[Booking])
-async def get_bookings(guest_name: Optional[str] = None):
-    """Get all bookings, optionally filtered by guest name"""
-    return booking_service.get_bookings(guest_name=guest_name)
+async def get_bookings(guest_name: Optional[str] = None, skip: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1)):
+    """Get bookings newest first, optionally filtered by guest name and paginated"""
+    return booking_service.get_bookings(guest_name=guest_name, skip=skip, limit=limit)
 
 @app.get("/api/bookings/{booking_id}", response_model=Booking)
 async def get_booking(booking_id: str):
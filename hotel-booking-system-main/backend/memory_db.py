@@ -0,0 +1,107 @@
+"""
+In-memory Database Manager for Hotel Room Booking Platform
+Dict-backed storage shared by every service in the process
+"""
+
+from typing import Dict
+from collections import defaultdict
+from operator import attrgetter
+import random
+import threading
+import uuid
+
+from sortedcontainers import SortedKeyList
+
+from models import Hotel, Room, Booking, RoomType
+
+CITIES = ("Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata",
+          "Hyderabad", "Pune", "Jaipur", "Goa", "Ahmedabad")
+NAME_PREFIXES = ("Grand", "Royal", "Imperial", "Golden", "Heritage",
+                 "Park", "Ocean", "Sunrise", "Lakeview", "Silver")
+NAME_SUFFIXES = ("Hotel", "Palace", "Resort", "Inn", "Suites", "Residency", "Plaza")
+HOTEL_AMENITIES = ("WiFi", "Pool", "Spa", "Restaurant", "Bar", "Gym",
+                   "Valet Parking", "Concierge", "Business Center", "Airport Shuttle")
+ROOM_AMENITIES = ("AC", "Smart TV", "Mini Bar", "Balcony", "City View", "Sea View",
+                  "WiFi", "Safe", "Coffee Machine")
+# Room types in declaration order; the tuples below are aligned with it and
+# indexed by position, so the room loop does no enum hashing or attribute access
+_ROOM_TYPES = tuple(RoomType)  # SINGLE, DOUBLE, SUITE, DELUXE
+_ROOM_TYPE_VALUES = tuple(room_type.value for room_type in _ROOM_TYPES)
+# Price factor over the hotel's base rate, per room type
+_PRICE_MULT = (1.0, 1.3, 2.5, 1.8)
+_SINGLE_IDX = _ROOM_TYPES.index(RoomType.SINGLE)
+_ROOM_TYPE_IDXS = range(len(_ROOM_TYPES))
+
+class DatabaseManager:
+    """In-memory database manager; every instance shares one store"""
+
+    hotels: Dict[str, Hotel]
+    rooms: Dict[str, Room]
+    bookings: Dict[str, Booking]
+    # Booking state kept next to the bookings rather than on BookingService,
+    # so every service instance checks and locks the same per-room data
+    booking_room_locks: Dict[str, threading.Lock]
+    booking_room_locks_guard: threading.Lock
+    bookings_by_room: Dict[str, SortedKeyList]  # confirmed only, by check-in ordinal
+    room_interval_arrays: Dict[str, tuple]
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        # Services each construct a DatabaseManager, so hand out the same
+        # instance to make them read and write the same dicts
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.hotels = {}
+                instance.rooms = {}
+                instance.bookings = {}
+                instance.booking_room_locks = {}
+                instance.booking_room_locks_guard = threading.Lock()
+                instance.bookings_by_room = defaultdict(lambda: SortedKeyList(key=attrgetter('_check_in_ord')))
+                instance.room_interval_arrays = {}
+                cls._instance = instance
+        return cls._instance
+
+    def add_hotel(self, hotel: Hotel) -> Hotel:
+        """Store a hotel and register its rooms for direct lookup"""
+        self.hotels[hotel.id] = hotel
+        for room in hotel.rooms:
+            self.rooms[room.id] = room
+        return hotel
+
+    def generate_sample_data(self, count: int = 1000):
+        """Generate `count` random hotels with rooms for load testing"""
+        for i in range(count):
+            city = random.choice(CITIES)
+            hotel = Hotel(
+                name=f"{random.choice(NAME_PREFIXES)} {city} {random.choice(NAME_SUFFIXES)}",
+                city=city,
+                address=f"{random.randint(1, 500)} MG Road, {city}",
+                star_rating=random.randint(1, 5),
+                description=f"Sample hotel #{i + 1} in {city}",
+                amenities=random.sample(HOTEL_AMENITIES, random.randint(3, 6)),
+            )
+            base_price = random.randint(1500, 20000)
+            # Draw each random column for the whole hotel in one call
+            room_count = random.randint(5, 30)
+            type_idxs = random.choices(_ROOM_TYPE_IDXS, k=room_count)
+            occupancies = random.choices(range(2, 5), k=room_count)
+            amenity_counts = random.choices(range(3, 7), k=room_count)
+            for j, type_idx in enumerate(type_idxs):
+                # Rooms far outnumber hotels: build these trusted values with
+                # model_construct, skipping validation. Every field is passed in
+                # declaration order so serialized output keeps the usual key order,
+                # and room_type as its value, as use_enum_values would store it.
+                hotel.rooms.append(Room.model_construct(
+                    id=str(uuid.uuid4()),
+                    hotel_id=hotel.id,
+                    room_number=f"{j // 10 + 1}{j % 10 + 1:02d}",
+                    room_type=_ROOM_TYPE_VALUES[type_idx],
+                    price=float(round(base_price * _PRICE_MULT[type_idx])),
+                    is_available=True,
+                    max_occupancy=2 if type_idx == _SINGLE_IDX else occupancies[j],
+                    amenities=random.sample(ROOM_AMENITIES, amenity_counts[j]),
+                ))
+            self.add_hotel(hotel)
@@ -4,7 +4,7 @@ Clean data structures with proper validation
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, List, Optional
 from datetime import date, datetime
 from enum import Enum
 import uuid
@@ -22,6 +22,10 @@ class BookingStatus(str, Enum):
     CANCELLED = "cancelled"
     PENDING = "pending"
 
+# Fields the derived lookup keys on Hotel and Booking are computed from
+_HOTEL_KEY_FIELDS = frozenset(("name", "city"))
+_BOOKING_KEY_FIELDS = frozenset(("guest_name", "check_in_date", "check_out_date"))
+
 class Room(BaseModel):
     """Room model with availability and pricing"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -47,6 +51,30 @@ class Hotel(BaseModel):
     amenities: List[str] = []
     rooms: List[Room] = []
     
+    def model_post_init(self, __context: Any):
+        # Case-folded search keys (_city_lc, _name_lc_words), computed once
+        # instead of on every index build. They go straight into the instance
+        # __dict__: pydantic private attributes are read through __getattr__,
+        # which costs more than the lowercasing they would save, and
+        # serialization only looks at declared fields.
+        self._set_search_keys()
+    
+    def _set_search_keys(self):
+        object.__setattr__(self, "_city_lc", self.city.casefold())
+        object.__setattr__(self, "_name_lc_words", tuple(self.name.casefold().split()))
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in _HOTEL_KEY_FIELDS:
+            self._set_search_keys()
+    
+    def model_copy(self, *, update=None, deep: bool = False):
+        # model_copy carries __dict__ over as is and skips model_post_init,
+        # so the copied keys would still describe the original's fields
+        copy = super().model_copy(update=update, deep=deep)
+        copy._set_search_keys()
+        return copy
+    
     def add_room(self, room: Room):
         """Add a room to the hotel"""
         room.hotel_id = self.id
@@ -65,6 +93,27 @@ class Booking(BaseModel):
     status: BookingStatus = BookingStatus.CONFIRMED
     created_at: datetime = Field(default_factory=datetime.now)
     
+    def model_post_init(self, __context: Any):
+        # Case-folded guest name for filtering, and date ordinals so overlap
+        # checks compare ints instead of dates; stored and refreshed like
+        # Hotel's search keys
+        self._set_lookup_keys()
+    
+    def _set_lookup_keys(self):
+        object.__setattr__(self, "_guest_name_lc", self.guest_name.casefold())
+        object.__setattr__(self, "_check_in_ord", self.check_in_date.toordinal())
+        object.__setattr__(self, "_check_out_ord", self.check_out_date.toordinal())
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in _BOOKING_KEY_FIELDS:
+            self._set_lookup_keys()
+    
+    def model_copy(self, *, update=None, deep: bool = False):
+        copy = super().model_copy(update=update, deep=deep)
+        copy._set_lookup_keys()
+        return copy
+    
     def validate_dates(self):
         """Validate booking dates"""
         if self.check_in_date >= self.check_out_date:
@@ -3,24 +3,47 @@ Business Logic Services for Hotel Room Booking Platform
 Clean separation of concerns with proper error handling
 """
 
-from typing import List, Optional
-from datetime import date, datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+from datetime import date
+import heapq
 import threading
-from collections import defaultdict
+import time
+from itertools import islice, takewhile
+from collections import OrderedDict, defaultdict, deque
+from operator import attrgetter
+
+import marisa_trie
+import numpy as np
+from pyroaring import BitMap
 
 from models import Hotel, Room, Booking, BookingRequest, RoomType, BookingStatus
 from database import DatabaseManager
 
+# Match name query words anywhere inside hotel-name words ("view" finds
+# "Oceanview"); False restricts matching to word prefixes, which keeps the trie
+# smaller and result sets tighter
+SUFFIX_MATCH = True
+
+# Independent lock + timestamp map pairs in the rate limiter; concurrent
+# guests only contend when their emails hash to the same shard
+NUM_SHARDS = 16
+
+# Enum members are singletons, so status checks can be identity compares
+_CONFIRMED = BookingStatus.CONFIRMED
+
 class HotelService:
     """Service for hotel and room management"""
     
-    def __init__(self):
+    def __init__(self, search_service: Optional["SearchService"] = None):
         self.db = DatabaseManager()
+        # Kept in sync with hotel inserts so new hotels are searchable at once
+        self.search_service = search_service
     
     def get_hotels(self, skip: int = 0, limit: int = 100) -> List[Hotel]:
         """Get hotels with pagination"""
-        hotels = list(self.db.hotels.values())
-        return hotels[skip:skip + limit]
+        # Dicts keep insertion order, so slice the view lazily instead of
+        # copying every hotel into a list
+        return list(islice(self.db.hotels.values(), skip, skip + limit))
     
     def get_hotel_by_id(self, hotel_id: str) -> Optional[Hotel]:
         """Get hotel by ID"""
@@ -28,7 +51,9 @@ class HotelService:
     
     def create_hotel(self, hotel: Hotel) -> Hotel:
         """Create a new hotel"""
-        self.db.hotels[hotel.id] = hotel
+        self.db.add_hotel(hotel)
+        if self.search_service:
+            self.search_service.add_hotel_to_index(hotel)
         return hotel
     
     def get_hotel_rooms(self, hotel_id: str) -> List[Room]:
@@ -43,44 +68,140 @@ class HotelService:
 class SearchService:
     """Service for hotel search with performance optimization"""
     
-    def __init__(self):
+    def __init__(self, suffix_match: bool = SUFFIX_MATCH):
         self.db = DatabaseManager()
-        # Create indexes for fast searching
-        self._city_index = defaultdict(list)
-        self._name_index = defaultdict(list)
-        # Simple in-memory cache: key -> (results, expires_at)
-        self._cache = {}
-        self._cache_ttl = timedelta(seconds=60)
+        self.suffix_match = suffix_match
+        # Hotels get dense integer indexes so the inverted indexes can be
+        # roaring bitmaps instead of sets of UUID strings
+        self._idx_by_id = {}
+        # idx -> Hotel object itself, so results need no second lookup by id
+        self._hotels_by_idx = []
+        # Inverted indexes for fast searching: key -> bitmap of hotel indexes
+        self._city_index = defaultdict(BitMap)
+        self._word_to_hotel_ids = defaultdict(BitMap)
+        # Trie of every suffix of every name word (only the whole words when
+        # suffix matching is off); _suffix_words[key id] lists the words
+        # ending in that suffix
+        self._name_trie = marisa_trie.Trie()
+        self._suffix_words = []
+        # The trie is immutable: words first seen after the last build are
+        # scanned directly until enough pile up to rebuild it
+        self._pending_words = set()
+        self._pending_words_max = 256
+        # Bounded LRU cache: key -> (results, expires_at on the monotonic clock)
+        self._cache = OrderedDict()
+        self._cache_ttl = 60.0  # seconds
+        self._cache_max_entries = 1024
+        # city_lc -> cached keys for that city ("" holds the city-less queries)
+        self._cache_keys_by_city = defaultdict(set)
         self._build_indexes()
     
+    def _hotel_idx(self, hotel: Hotel) -> int:
+        idx = self._idx_by_id.get(hotel.id)
+        if idx is None:
+            idx = self._idx_by_id[hotel.id] = len(self._hotels_by_idx)
+            self._hotels_by_idx.append(hotel)
+        else:
+            # Re-indexing may bring a new object stored under the same id
+            self._hotels_by_idx[idx] = hotel
+        return idx
+    
+    def _index_hotel(self, hotel: Hotel):
+        idx = self._hotel_idx(hotel)
+        # City index (case-insensitive)
+        self._city_index[hotel._city_lc].add(idx)
+        
+        # Name index (case-insensitive, partial matching)
+        for word in hotel._name_lc_words:
+            self._word_to_hotel_ids[word].add(idx)
+    
     def _build_indexes(self):
         """Build search indexes for performance"""
         for hotel in self.db.hotels.values():
-            # City index (case-insensitive)
-            city_key = hotel.city.lower()
-            self._city_index[city_key].append(hotel)
-            
-            # Name index (case-insensitive, partial matching)
-            name_words = hotel.name.lower().split()
-            for word in name_words:
-                self._name_index[word].append(hotel)
+            self._index_hotel(hotel)
+        self._build_name_trie()
+    
+    def _build_name_trie(self):
+        # A word contains the query iff one of its suffixes starts with it,
+        # so a trie prefix lookup over all suffixes gives substring matching
+        suffix_words = defaultdict(list)
+        for word in self._word_to_hotel_ids:
+            for i in range(len(word) if self.suffix_match else 1):
+                suffix_words[word[i:]].append(word)
+        self._name_trie = marisa_trie.Trie(suffix_words)
+        self._suffix_words = [None] * len(self._name_trie)
+        for suffix, key_id in self._name_trie.items():
+            self._suffix_words[key_id] = suffix_words[suffix]
+        self._pending_words.clear()
     
-    def _cache_key(self, city: Optional[str], hotel_name: Optional[str], limit: int) -> str:
-        return f"city={city or ''}|name={hotel_name or ''}|limit={limit}"
+    def _words_containing(self, word: str) -> set:
+        """Indexed words containing `word`: O(matches), not O(vocabulary)"""
+        matched_words = set()
+        for _, key_id in self._name_trie.items(word):
+            matched_words.update(self._suffix_words[key_id])
+        if self.suffix_match:
+            matched_words.update(w for w in self._pending_words if word in w)
+        else:
+            matched_words.update(w for w in self._pending_words if w.startswith(word))
+        return matched_words
     
-    def _get_cached(self, key: str):
+    def add_hotel_to_index(self, hotel: Hotel):
+        """Index a newly added hotel in O(words in name) instead of a full rebuild"""
+        # Hotel ids come from the client: a re-added id must not keep the bits
+        # of whatever was indexed under it before
+        self.remove_hotel_from_index(hotel)
+        # Words already in the index are covered by the trie; only new ones go pending
+        self._pending_words.update(w for w in hotel._name_lc_words if w not in self._word_to_hotel_ids)
+        self._index_hotel(hotel)
+        if len(self._pending_words) > self._pending_words_max:
+            self._build_name_trie()
+        self._invalidate_city(hotel._city_lc)
+    
+    def remove_hotel_from_index(self, hotel: Hotel):
+        """Drop a hotel from the indexes; emptied word buckets simply match nothing"""
+        idx = self._idx_by_id.get(hotel.id)
+        if idx is None:
+            return
+        # Clear the bits set for the object actually indexed under this id,
+        # which may be an older hotel than the one passed in
+        indexed = self._hotels_by_idx[idx]
+        self._city_index[indexed._city_lc].discard(idx)
+        for word in indexed._name_lc_words:
+            self._word_to_hotel_ids[word].discard(idx)
+        self._invalidate_city(indexed._city_lc)
+    
+    def _invalidate_city(self, city_key: str):
+        # A changed hotel can only appear in queries for its own city or
+        # in queries without a city filter
+        for key in (city_key, ""):
+            for cache_key in self._cache_keys_by_city.pop(key, ()):
+                self._cache.pop(cache_key, None)
+    
+    def _cache_key(self, city_key: str, name_key: str, limit: int) -> Tuple[str, str, int]:
+        # Keys are already case-folded, so queries differing only in case share an entry
+        return (city_key, name_key, limit)
+    
+    def _get_cached(self, key: Tuple[str, str, int]):
         entry = self._cache.get(key)
         if not entry:
             return None
         results, expires_at = entry
-        if datetime.utcnow() > expires_at:
+        if time.monotonic() > expires_at:
             # Expired
             self._cache.pop(key, None)
+            self._cache_keys_by_city[key[0]].discard(key)
             return None
+        self._cache.move_to_end(key)
         return results
     
-    def _set_cache(self, key: str, results: List[Hotel]):
-        self._cache[key] = (results, datetime.utcnow() + self._cache_ttl)
+    def _set_cache(self, key: Tuple[str, str, int], results: List[Hotel]):
+        self._cache[key] = (results, time.monotonic() + self._cache_ttl)
+        self._cache.move_to_end(key)
+        self._cache_keys_by_city[key[0]].add(key)
+        if len(self._cache) > self._cache_max_entries:
+            # Evict the least recently used entry
+            evicted, _ = self._cache.popitem(last=False)
+            self._cache_keys_by_city[evicted[0]].discard(evicted)
     
     def search_hotels(self, city: Optional[str] = None, 
                      hotel_name: Optional[str] = None, 
@@ -90,114 +211,133 @@ class SearchService:
         Uses indexed search for O(1) city lookup and O(k) name matching
         Caching: caches results for identical queries for a short TTL
         """
-        cache_key = self._cache_key(city, hotel_name, limit)
+        # Canonicalize case once, the same way the indexed fields were folded;
+        # reused for the cache key and index lookups
+        city_key = city.casefold() if city else ""
+        name_key = hotel_name.casefold() if hotel_name else ""
+        cache_key = self._cache_key(city_key, name_key, limit)
         cached = self._get_cached(cache_key)
         if cached is not None:
             return cached
         
         if not city and not hotel_name:
-            results_list = list(self.db.hotels.values())[:limit]
+            results_list = list(islice(self.db.hotels.values(), limit))
             self._set_cache(cache_key, results_list)
             return results_list
         
-        # Use ID sets to avoid unhashable model instances
-        result_ids = set()
+        # One candidate bitmap per criterion; a hotel must match all of them
+        # (the city and every word of the name)
+        candidate_sets = []
         
         # Search by city (exact match, case-insensitive)
         if city:
-            city_key = city.lower()
-            city_results = self._city_index.get(city_key, [])
-            for hotel in city_results:
-                result_ids.add(hotel.id)
+            candidate_sets.append(self._city_index.get(city_key, BitMap()))
         
         # Search by hotel name (partial match, case-insensitive)
         if hotel_name:
-            name_words = hotel_name.lower().split()
-            name_result_ids = set()
-            
-            for word in name_words:
-                # Find hotels containing this word
-                for indexed_word, hotels in self._name_index.items():
-                    if word in indexed_word:
-                        for h in hotels:
-                            name_result_ids.add(h.id)
-            
-            if city:
-                # Intersection: hotels that match both city and name
-                result_ids = result_ids.intersection(name_result_ids)
-            else:
-                result_ids = name_result_ids
+            for word in name_key.split():
+                matched_words = self._words_containing(word)
+                candidate_sets.append(BitMap.union(BitMap(), *(self._word_to_hotel_ids[w] for w in matched_words)))
+        
+        # Roaring intersection works container by container in C; starting
+        # from the most selective criterion keeps intermediates small
+        candidate_sets.sort(key=len)
+        result_idxs = BitMap.intersection(*candidate_sets) if candidate_sets else BitMap()
         
-        # Convert to list and apply limit
-        results_list = [self.db.hotels[h_id] for h_id in result_ids][:limit]
+        # Bitmaps iterate in index order, so the limit applies before any lookup
+        results_list = [self._hotels_by_idx[i] for i in islice(result_idxs, limit)]
         self._set_cache(cache_key, results_list)
         return results_list
     
     def rebuild_indexes(self):
         """Rebuild search indexes (call when hotels are added/updated)"""
+        self._idx_by_id.clear()
+        self._hotels_by_idx.clear()
         self._city_index.clear()
-        self._name_index.clear()
+        self._word_to_hotel_ids.clear()
         self._build_indexes()
         # Invalidate cache on data/index changes
         self._cache.clear()
+        self._cache_keys_by_city.clear()
 
 class BookingService:
     """Service for booking management with double-booking prevention"""
     
     def __init__(self):
         self.db = DatabaseManager()
-        # Thread lock for preventing simultaneous bookings
-        self._booking_lock = threading.Lock()
-        # Simple per-guest rate limiter: email -> [timestamps]
-        self._rate_limit_window = timedelta(seconds=60)
+        # Per-room locks: only bookings for the same room serialize. They and
+        # the booking indexes below are shared through the store, so separate
+        # BookingService instances still see and exclude each other's bookings
+        self._room_locks = self.db.booking_room_locks
+        self._room_locks_guard = self.db.booking_room_locks_guard
+        # Simple per-guest rate limiter: email -> deque of monotonic_ns
+        # timestamps, oldest first
+        self._rate_limit_window_ns = 60 * 1_000_000_000
         self._rate_limit_max = 5  # max bookings per window per email
-        self._requests_by_email = defaultdict(list)
-    
-    def _is_rate_limited(self, guest_email: str) -> bool:
-        now = datetime.utcnow()
-        window_start = now - self._rate_limit_window
-        timestamps = self._requests_by_email[guest_email]
-        # drop old timestamps
-        self._requests_by_email[guest_email] = [t for t in timestamps if t >= window_start]
-        if len(self._requests_by_email[guest_email]) >= self._rate_limit_max:
-            return True
-        self._requests_by_email[guest_email].append(now)
-        return False
+        self._rate_shards = [(threading.Lock(), defaultdict(deque)) for _ in range(NUM_SHARDS)]
+        # Confirmed bookings per room, ordered by check-in date ordinal
+        self._bookings_by_room = self.db.bookings_by_room
+        # room id -> (check-in ordinals, running max of check-out ordinals) for
+        # bulk availability checks; dropped whenever the room's bookings change
+        self._interval_arrays = self.db.room_interval_arrays
+    
+    def _get_room_lock(self, room_id: str) -> threading.Lock:
+        lock = self._room_locks.get(room_id)
+        if lock is None:
+            # The guard is only taken the first time a room is booked
+            with self._room_locks_guard:
+                lock = self._room_locks.setdefault(room_id, threading.Lock())
+        return lock
+    
+    def _is_rate_limited(self, guest_email: str, now_ns: int) -> bool:
+        # Plain integer arithmetic: no datetime allocation per attempt
+        window_start = now_ns - self._rate_limit_window_ns
+        lock, requests_by_email = self._rate_shards[hash(guest_email) % NUM_SHARDS]
+        with lock:
+            timestamps = requests_by_email[guest_email]
+            # drop old timestamps from the front, in place
+            while timestamps and timestamps[0] < window_start:
+                timestamps.popleft()
+            if len(timestamps) >= self._rate_limit_max:
+                return True
+            timestamps.append(now_ns)
+            return False
     
     def create_booking(self, booking_request: BookingRequest) -> Booking:
         """
-        Create booking with double-booking prevention using thread locks
-        This ensures thread-safe booking operations
+        Create booking with double-booking prevention using per-room thread locks
+        Bookings for the same room are serialized; different rooms proceed in parallel
         Rate limiting: restrict excessive booking attempts per guest email
         """
-        with self._booking_lock:
-            # Rate limiting check
-            if self._is_rate_limited(booking_request.guest_email):
-                raise ValueError("Rate limit exceeded. Please try again later.")
-            
-            # Validate room exists
-            room = self.db.rooms.get(booking_request.room_id)
-            if not room:
-                raise ValueError("Room not found")
-            
-            # Validate dates
-            if booking_request.check_in_date > booking_request.check_out_date:
-                raise ValueError("Check-out date must be after or same as check-in date")
-            
-            if booking_request.check_in_date < date.today():
-                raise ValueError("Check-in date cannot be in the past")
-            
+        # Rate limiting check
+        if self._is_rate_limited(booking_request.guest_email, time.monotonic_ns()):
+            raise ValueError("Rate limit exceeded. Please try again later.")
+        
+        # Validate room exists
+        room = self.db.rooms.get(booking_request.room_id)
+        if not room:
+            raise ValueError("Room not found")
+        
+        # Validate dates
+        if booking_request.check_in_date > booking_request.check_out_date:
+            raise ValueError("Check-out date must be after or same as check-in date")
+        
+        if booking_request.check_in_date < date.today():
+            raise ValueError("Check-in date cannot be in the past")
+        
+        # Calculate total price (charge minimum 1 night)
+        nights = booking_request.check_out_date.toordinal() - booking_request.check_in_date.toordinal()
+        nights_charged = max(1, nights)
+        total_price = room.price * nights_charged
+        
+        # Only the availability check and the insert must be atomic
+        with self._get_room_lock(booking_request.room_id):
             # Check for overlapping bookings
             if self._has_overlapping_booking(booking_request.room_id, 
                                            booking_request.check_in_date, 
                                            booking_request.check_out_date):
                 raise ValueError("Room is not available for the selected dates")
             
-            # Calculate total price (charge minimum 1 night)
-            nights = (booking_request.check_out_date - booking_request.check_in_date).days
-            nights_charged = max(1, nights)
-            total_price = room.price * nights_charged
-            
             # Create booking
             booking = Booking(
                 room_id=booking_request.room_id,
@@ -211,23 +351,79 @@ class BookingService:
             
             # Store booking
             self.db.bookings[booking.id] = booking
+            self._bookings_by_room[booking.room_id].add(booking)
+            self._interval_arrays.pop(booking.room_id, None)
             return booking
     
     def _has_overlapping_booking(self, room_id: str, check_in: date, check_out: date) -> bool:
-        """Check if there are overlapping bookings for the room"""
-        for booking in self.db.bookings.values():
-            if (booking.room_id == room_id and 
-                booking.status == BookingStatus.CONFIRMED and
-                not (check_out <= booking.check_in_date or check_in >= booking.check_out_date)):
-                return True
-        return False
+        """
+        Check if there are overlapping bookings for the room
+        Only this room's confirmed bookings are examined: O(log n + k) via bisect
+        """
+        room_bookings = self._bookings_by_room.get(room_id)
+        if not room_bookings:
+            return False
+        # Compare date ordinals: plain int compares instead of date.__lt__
+        check_in_ord = check_in.toordinal()
+        check_out_ord = check_out.toordinal()
+        # Candidates are the bookings that check in before our check-out,
+        # latest first; each one overlaps iff it checks out after our check-in
+        candidates = room_bookings.irange_key(max_key=check_out_ord, inclusive=(True, False), reverse=True)
+        # Confirmed multi-night stays never overlap each other, so once one
+        # ends by our check-in every earlier booking does too
+        candidates = takewhile(lambda b: not (b._check_in_ord < b._check_out_ord <= check_in_ord), candidates)
+        return any(check_in_ord < b._check_out_ord for b in candidates)
+    
+    def _room_interval_arrays(self, room_id: str):
+        arrays = self._interval_arrays.get(room_id)
+        if arrays is None:
+            room_bookings = self._bookings_by_room.get(room_id, ())
+            n = len(room_bookings)
+            check_ins = np.fromiter((b._check_in_ord for b in room_bookings), dtype=np.int32, count=n)
+            check_outs = np.fromiter((b._check_out_ord for b in room_bookings), dtype=np.int32, count=n)
+            arrays = (check_ins, np.maximum.accumulate(check_outs) if n else check_outs)
+            self._interval_arrays[room_id] = arrays
+        return arrays
+    
+    def check_availability(self, room_id: str, date_ranges: List[Tuple[date, date]]) -> List[bool]:
+        """
+        Check many (check_in, check_out) ranges against one room at once
+        Vectorized with NumPy: one searchsorted over the room's bookings for all ranges
+        """
+        # Checked before taking the lock, so unknown ids never get one
+        if room_id not in self.db.rooms:
+            raise ValueError("Room not found")
+        n = len(date_ranges)
+        query_ins = np.fromiter((r[0].toordinal() for r in date_ranges), dtype=np.int32, count=n)
+        query_outs = np.fromiter((r[1].toordinal() for r in date_ranges), dtype=np.int32, count=n)
+        if (query_ins > query_outs).any():
+            raise ValueError("Check-out date must be after or same as check-in date")
+        with self._get_room_lock(room_id):
+            check_ins, latest_check_outs = self._room_interval_arrays(room_id)
+        if not len(check_ins):
+            return [True] * n
+        # Candidates are the bookings that check in before each range's check-out;
+        # the range is taken iff the latest of their check-outs is after its check-in
+        end = np.searchsorted(check_ins, query_outs, side='left')
+        taken = (end > 0) & (latest_check_outs[np.maximum(end - 1, 0)] > query_ins)
+        return (~taken).tolist()
+    
+    def _iter_bookings(self, guest_name: Optional[str] = None) -> Iterator[Booking]:
+        """Yield bookings lazily, optionally filtered by guest name"""
+        if not guest_name:
+            return iter(self.db.bookings.values())
+        needle = guest_name.casefold()
+        return (b for b in self.db.bookings.values() if needle in b._guest_name_lc)
     
-    def get_bookings(self, guest_name: Optional[str] = None) -> List[Booking]:
-        """Get all bookings, optionally filtered by guest name"""
-        bookings = list(self.db.bookings.values())
-        if guest_name:
-            bookings = [b for b in bookings if guest_name.lower() in b.guest_name.lower()]
-        return sorted(bookings, key=lambda x: x.created_at, reverse=True)
+    def get_bookings(self, guest_name: Optional[str] = None,
+                     skip: int = 0, limit: Optional[int] = None) -> List[Booking]:
+        """Get bookings newest first, optionally filtered by guest name and paginated"""
+        bookings = self._iter_bookings(guest_name)
+        if limit is None:
+            # Bookings are stored roughly in creation order, which Timsort handles in near-linear time
+            return sorted(bookings, key=attrgetter('created_at'), reverse=True)[skip:]
+        # Only the newest skip + limit bookings are ever held, not the whole filtered set
+        return heapq.nlargest(skip + limit, bookings, key=attrgetter('created_at'))[skip:]
     
     def get_booking_by_id(self, booking_id: str) -> Optional[Booking]:
         """Get booking by ID"""
@@ -237,6 +433,10 @@ class BookingService:
         """Cancel a booking"""
         booking = self.db.bookings.get(booking_id)
         if booking:
-            booking.status = BookingStatus.CANCELLED
+            with self._get_room_lock(booking.room_id):
+                if booking.status is _CONFIRMED:
+                    self._bookings_by_room[booking.room_id].discard(booking)
+                    self._interval_arrays.pop(booking.room_id, None)
+                booking.status = BookingStatus.CANCELLED
             return True
         return False
@@ -0,0 +1,427 @@
+"""
+Database Manager for Hotel Room Booking Platform using SQLAlchemy ORM
+"""
+
+from sqlalchemy import create_engine, event, insert, or_, select, bindparam, text, Column, Integer, String, Float, ForeignKey, Date, Enum, Index, Table, Text
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker, scoped_session, selectinload, raiseload
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import func
+from enum import Enum as PyEnum
+from typing import List
+import random
+import os
+
+Base = declarative_base()
+
+# Enum for RoomType
+class RoomType(PyEnum):
+    SINGLE = "Single"
+    DOUBLE = "Double"
+    DELUXE = "Deluxe"
+    SUITE = "Suite"
+
+_ROOM_TYPES = tuple(RoomType)
+
+# Known amenities, one bit each in the Integer amenities columns.
+# The position is the stored format: only ever append to this tuple.
+# The vocabulary is closed: names not listed here cannot be stored.
+AMENITIES = (
+    "WiFi", "Pool", "Spa", "Restaurant", "Bar", "Valet Parking", "Concierge",
+    "Business Center", "Gym", "Airport Shuttle", "AC", "Smart TV", "Mini Bar",
+    "Balcony", "City View", "Sea View", "Mountain View", "Safe", "Coffee Machine",
+    "Butler Service",
+)
+AMENITY_BITS = {name: 1 << i for i, name in enumerate(AMENITIES)}
+
+def pack_amenities(names) -> int:
+    """Fold amenity names into a bitmask; raises ValueError for names outside AMENITIES"""
+    mask = 0
+    for name in names:
+        try:
+            mask |= AMENITY_BITS[name]
+        except KeyError:
+            raise ValueError(f"Unknown amenity: {name}") from None
+    return mask
+
+def unpack_amenities(mask: int) -> List[str]:
+    """Expand a bitmask back into amenity names"""
+    return [name for name, bit in AMENITY_BITS.items() if mask & bit]
+
+_ROOM_AMENITY_POOL = (
+    "AC", "Smart TV", "Mini Bar", "Balcony", "City View", "Sea View",
+    "Mountain View", "WiFi", "Safe", "Coffee Machine", "Butler Service"
+)
+# The same pool as single bits; a sample of distinct bits sums to its mask
+_ROOM_AMENITY_POOL_BITS = tuple(AMENITY_BITS[name] for name in _ROOM_AMENITY_POOL)
+
+class Hotel(Base):
+    __tablename__ = 'hotels'
+    __table_args__ = (Index("ix_hotels_city", "city"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(150), nullable=False)
+    city = Column(String(100), nullable=False)
+    address = Column(String(200))
+    star_rating = Column(Integer)
+    description = Column(Text)
+    amenities = Column(Integer, nullable=False, default=0)  # Bitmask over AMENITY_BITS
+
+    rooms = relationship('Room', back_populates='hotel', cascade="all, delete-orphan")
+
+    @property
+    def amenity_names(self) -> List[str]:
+        return unpack_amenities(self.amenities)
+
+class Room(Base):
+    __tablename__ = 'rooms'
+    __table_args__ = (Index("ix_rooms_hotel_id", "hotel_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    hotel_id = Column(Integer, ForeignKey('hotels.id'))
+    room_number = Column(String(20), nullable=False)
+    room_type = Column(Enum(RoomType), nullable=False)
+    price = Column(Integer)
+    max_occupancy = Column(Integer)
+    amenities = Column(Integer, nullable=False, default=0)  # Bitmask over AMENITY_BITS
+
+    hotel = relationship('Hotel', back_populates='rooms')
+    bookings = relationship('Booking', back_populates='room', cascade="all, delete-orphan")
+
+    @property
+    def amenity_names(self) -> List[str]:
+        return unpack_amenities(self.amenities)
+
+class Booking(Base):
+    __tablename__ = 'bookings'
+    # Covers the per-room date-range lookups used for overlap checks
+    __table_args__ = (Index("ix_bookings_room_dates", "room_id", "check_in", "check_out"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    room_id = Column(Integer, ForeignKey('rooms.id'))
+    customer_name = Column(String(100))
+    check_in = Column(Date)
+    check_out = Column(Date)
+
+    room = relationship('Room', back_populates='bookings')
+
+# Statements built once at import and reused, so each call skips
+# construction and hits the engine's compiled-statement cache
+_HOTEL_INS = insert(Hotel.__table__).returning(Hotel.__table__.c.id, sort_by_parameter_order=True)
+_ROOM_INS = insert(Room.__table__)
+_SEL_HOTELS_ALL = select(Hotel)
+_SEL_HOTELS_BY_CITY = select(Hotel).where(Hotel.city == bindparam("city"))
+_SEL_ROOMS_BY_HOTEL = select(Room).where(Room.hotel_id == bindparam("hid"))
+# Aggregates answered from ix_hotels_city / ix_rooms_hotel_id alone
+_SEL_CITY_COUNTS = select(Hotel.city, func.count()).group_by(Hotel.city)
+_SEL_ROOM_COUNTS = select(Room.hotel_id, func.count()).group_by(Room.hotel_id)
+
+# SQLite FTS5 index over hotel text, kept in sync with `hotels` by triggers
+_HOTELS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE hotels_fts USING fts5("
+    "name, city, description, content='hotels', content_rowid='id')",
+    "CREATE TRIGGER hotels_fts_ai AFTER INSERT ON hotels BEGIN "
+    "INSERT INTO hotels_fts(rowid, name, city, description) "
+    "VALUES (new.id, new.name, new.city, new.description); END",
+    "CREATE TRIGGER hotels_fts_ad AFTER DELETE ON hotels BEGIN "
+    "INSERT INTO hotels_fts(hotels_fts, rowid, name, city, description) "
+    "VALUES ('delete', old.id, old.name, old.city, old.description); END",
+    "CREATE TRIGGER hotels_fts_au AFTER UPDATE ON hotels BEGIN "
+    "INSERT INTO hotels_fts(hotels_fts, rowid, name, city, description) "
+    "VALUES ('delete', old.id, old.name, old.city, old.description); "
+    "INSERT INTO hotels_fts(rowid, name, city, description) "
+    "VALUES (new.id, new.name, new.city, new.description); END",
+    # Index any hotels that were stored before the FTS table existed
+    "INSERT INTO hotels_fts(hotels_fts) VALUES ('rebuild')",
+)
+_FTS_MATCH = text("SELECT rowid FROM hotels_fts WHERE hotels_fts MATCH :q ORDER BY rank LIMIT :limit")
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """Per-connection SQLite tuning: WAL lets readers run alongside a writer,
+    busy_timeout waits on locks instead of failing with "database is locked"."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def _is_sqlite_memory_url(db_url) -> bool:
+    """True for in-memory SQLite URLs: sqlite://, sqlite:///:memory: and mode=memory URIs"""
+    url = make_url(db_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    return not url.database or url.database == ":memory:" or url.query.get("mode") == "memory"
+
+# Database Manager
+class DatabaseManager:
+    """Database manager using SQLAlchemy."""
+
+    def __init__(self, db_url=None):
+        # Use SQLite by default
+        if not db_url:
+            db_url = os.environ.get("HOTEL_DB_URL", "sqlite:///hotels.db")
+        is_sqlite = db_url.startswith("sqlite")
+        # FastAPI serves requests from a thread pool, so pooled SQLite
+        # connections must be usable outside the thread that opened them
+        connect_args = {"check_same_thread": False} if is_sqlite else {}
+        # Size the pool for the API thread pool so requests reuse connections.
+        # In-memory SQLite shares one connection across all threads (StaticPool):
+        # every new connection, including a per-thread one, would otherwise open
+        # a separate, empty database.
+        if _is_sqlite_memory_url(db_url):
+            pool_args = {"poolclass": StaticPool}
+        else:
+            pool_args = dict(pool_size=25, max_overflow=25, pool_pre_ping=True, pool_recycle=1800)
+        self.engine = create_engine(db_url, echo=False, future=True, query_cache_size=1200,
+                                    connect_args=connect_args, **pool_args)
+        if is_sqlite:
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(self.engine)
+        self.has_fts = is_sqlite and self._create_fts_index()
+        # Writes flush explicitly on commit; keeping loaded state after commit
+        # saves a refresh SELECT when callers read ids/attributes back
+        self.Session = scoped_session(sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False))
+
+    def _create_fts_index(self) -> bool:
+        """Create the hotels_fts table and triggers once; False if FTS5 is unavailable"""
+        try:
+            with self.engine.begin() as conn:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='hotels_fts'"
+                ).first()
+                if not exists:
+                    for ddl in _HOTELS_FTS_DDL:
+                        conn.exec_driver_sql(ddl)
+            return True
+        except OperationalError:
+            # SQLite built without FTS5
+            return False
+
+    def add_hotel(self, hotel_data: dict, rooms_data: List[dict]):
+        session = self.Session()
+        try:
+            hotel_id = session.execute(_HOTEL_INS, [{
+                "name": hotel_data["name"],
+                "city": hotel_data["city"],
+                "address": hotel_data.get("address", ""),
+                "star_rating": hotel_data.get("rating", 0),
+                "description": hotel_data.get("description", ""),
+                "amenities": pack_amenities(hotel_data.get("amenities", [])),
+            }]).scalar_one()
+
+            # Plain dicts skip the per-object unit-of-work bookkeeping
+            room_rows = [
+                {
+                    "hotel_id": hotel_id,
+                    "room_number": room_info["room_number"],
+                    "room_type": RoomType(room_info["room_type"]),
+                    "price": room_info["price"],
+                    "max_occupancy": room_info.get("max_occupancy", 2),
+                    "amenities": pack_amenities(room_info.get("amenities", [])),
+                }
+                for room_info in rooms_data
+            ]
+            if room_rows:
+                session.execute(_ROOM_INS, room_rows)
+            session.commit()
+            return hotel_id
+        except IntegrityError:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_hotels(self, city=None, with_rooms=False, skip=0, limit=None):
+        session = self.Session()
+        try:
+            stmt = _SEL_HOTELS_BY_CITY if city else _SEL_HOTELS_ALL
+            if with_rooms:
+                # One extra IN query for all rooms instead of one per hotel
+                stmt = stmt.options(selectinload(Hotel.rooms))
+            else:
+                # Fail loudly rather than lazy-loading per row
+                stmt = stmt.options(raiseload("*"))
+            if skip or limit is not None:
+                stmt = stmt.order_by(Hotel.id).offset(skip).limit(limit)
+            hotels = session.execute(stmt, {"city": city} if city else {}).scalars().all()
+            return hotels
+        finally:
+            session.close()
+
+    def iter_hotels(self, city=None, chunk_size=500):
+        """Stream hotels for full scans, holding one chunk of rows at a time"""
+        stmt = (_SEL_HOTELS_BY_CITY if city else _SEL_HOTELS_ALL).options(raiseload("*"))
+        return self._stream(stmt, {"city": city} if city else {}, chunk_size)
+
+    def search_hotels(self, query: str, limit: int = 50):
+        """Search hotels by words in name, city or description (prefix match, all words required)
+
+        With FTS5 results come in rank order and words are split on punctuation as
+        well as spaces; without it a LIKE scan matches the same way on space-separated
+        words and returns results in id order.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        session = self.Session()
+        try:
+            if self.has_fts:
+                # Quote each term so user input is never parsed as FTS syntax
+                match = " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+                ids = session.execute(_FTS_MATCH, {"q": match, "limit": limit}).scalars().all()
+                if not ids:
+                    return []
+                stmt = _SEL_HOTELS_ALL.where(Hotel.id.in_(ids)).options(raiseload("*"))
+                by_id = {hotel.id: hotel for hotel in session.execute(stmt).scalars()}
+                # Keep FTS rank order
+                return [by_id[hotel_id] for hotel_id in ids if hotel_id in by_id]
+            stmt = _SEL_HOTELS_ALL.options(raiseload("*")).order_by(Hotel.id).limit(limit)
+            for term in terms:
+                # Escape LIKE wildcards so user input matches literally
+                pattern = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                stmt = stmt.where(or_(*(
+                    condition
+                    for column in (Hotel.name, Hotel.city, Hotel.description)
+                    for condition in (column.ilike(f"{pattern}%", escape="\\"),
+                                      column.ilike(f"% {pattern}%", escape="\\"))
+                )))
+            return session.execute(stmt).scalars().all()
+        finally:
+            session.close()
+
+    def get_rooms_by_hotel(self, hotel_id, amenities=None):
+        session = self.Session()
+        try:
+            stmt = _SEL_ROOMS_BY_HOTEL
+            if amenities:
+                # Rooms having every requested amenity: one AND per row
+                mask = pack_amenities(amenities)
+                stmt = stmt.where(Room.amenities.op("&")(mask) == mask)
+            rooms = session.execute(stmt.options(raiseload("*")), {"hid": hotel_id}).scalars().all()
+            return rooms
+        finally:
+            session.close()
+
+    def get_city_stats(self):
+        """Number of hotels per city"""
+        session = self.Session()
+        try:
+            return dict(session.execute(_SEL_CITY_COUNTS).all())
+        finally:
+            session.close()
+
+    def get_room_counts(self):
+        """Number of rooms per hotel id"""
+        session = self.Session()
+        try:
+            return dict(session.execute(_SEL_ROOM_COUNTS).all())
+        finally:
+            session.close()
+
+    def book_room(self, room_id, customer_name, check_in, check_out):
+        session = self.Session()
+        try:
+            booking = Booking(
+                room_id=room_id,
+                customer_name=customer_name,
+                check_in=check_in,
+                check_out=check_out
+            )
+            session.add(booking)
+            session.commit()
+            return booking.id
+        except IntegrityError:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _bookings_query(self, hotel_id=None, room_id=None):
+        stmt = select(Booking)
+        if room_id:
+            stmt = stmt.where(Booking.room_id == room_id)
+        elif hotel_id:
+            stmt = stmt.join(Room).where(Room.hotel_id == hotel_id)
+        return stmt
+
+    def get_bookings(self, hotel_id=None, room_id=None, skip=0, limit=None):
+        session = self.Session()
+        try:
+            stmt = self._bookings_query(hotel_id, room_id).options(selectinload(Booking.room))
+            if skip or limit is not None:
+                stmt = stmt.order_by(Booking.id).offset(skip).limit(limit)
+            bookings = session.execute(stmt).scalars().all()
+            return bookings
+        finally:
+            session.close()
+
+    def iter_bookings(self, hotel_id=None, room_id=None, chunk_size=500):
+        """Stream bookings for full scans, holding one chunk of rows at a time"""
+        stmt = self._bookings_query(hotel_id, room_id).options(raiseload("*"))
+        return self._stream(stmt, {}, chunk_size)
+
+    def _stream(self, stmt, params, chunk_size):
+        # The session stays open until the caller exhausts or closes the generator.
+        # It is private rather than the thread-local scoped session, which every
+        # other method closes when it returns.
+        session = self.Session.session_factory()
+        try:
+            result = session.execute(stmt.execution_options(yield_per=chunk_size), params)
+            yield from result.scalars()
+        finally:
+            session.close()
+
+    # Add more methods as needed: update, delete, etc.
+
+    def populate_sample_data(self):
+        """Populate the database with sample hotels and rooms."""
+        # Core executemany inserts in a single transaction: one round-trip for
+        # all hotels (ids come back via RETURNING) and one for all rooms
+        with self.engine.begin() as conn:
+            # Only add if DB is empty
+            if conn.execute(select(func.count()).select_from(Hotel.__table__)).scalar() > 0:
+                print("Sample data already exists.")
+                return
+            hotel_data_list = [
+                # Add sample hotel data as in your original file
+                {"name": "The Taj Mahal Palace Mumbai", "city": "Mumbai", "address": "Apollo Bunder, Colaba", "rating": 5, 
+                 "description": "Iconic luxury hotel overlooking the Gateway of India", 
+                 "amenities": ["WiFi", "Pool", "Spa", "Restaurant", "Bar", "Valet Parking", "Concierge", "Business Center"]},
+                # ... add more hotels as per your previous initial data
+            ]
+            hotel_rows = [
+                {
+                    "name": hotel_info["name"],
+                    "city": hotel_info["city"],
+                    "address": hotel_info["address"],
+                    "star_rating": hotel_info["rating"],
+                    "description": hotel_info["description"],
+                    "amenities": pack_amenities(hotel_info["amenities"]),
+                }
+                for hotel_info in hotel_data_list
+            ]
+            hotel_ids = conn.execute(_HOTEL_INS, hotel_rows).scalars().all()
+
+            room_rows = []
+            for hotel_id, hotel_info in zip(hotel_ids, hotel_data_list):
+                # Add rooms; draw each random column for the whole hotel in one call
+                room_count = random.randint(50, 150) if hotel_info['rating'] == 5 else random.randint(80, 200)
+                price_range = range(8000, 25001) if hotel_info['rating'] == 5 else range(3000, 12001)
+                room_types = random.choices(_ROOM_TYPES, k=room_count)
+                prices = random.choices(price_range, k=room_count)
+                floors = random.choices(range(1, 11), k=room_count)
+                occupancies = random.choices(range(2, 5), k=room_count)
+                amenity_counts = random.choices(range(5, 9), k=room_count)
+                for j, room_type in enumerate(room_types):
+                    room_rows.append({
+                        "hotel_id": hotel_id,
+                        "room_number": f"{floors[j]}{j+1:02d}",
+                        "room_type": room_type,
+                        "price": prices[j],
+                        "max_occupancy": 2 if room_type is RoomType.SINGLE else occupancies[j],
+                        "amenities": sum(random.sample(_ROOM_AMENITY_POOL_BITS, amenity_counts[j]))
+                    })
+            conn.execute(_ROOM_INS, room_rows)
+        print("Sample data populated.")
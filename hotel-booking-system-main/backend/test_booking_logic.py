@@ -12,6 +12,7 @@ import time
 from models import Hotel, Room, Booking, BookingRequest, RoomType
 from services import HotelService, BookingService, SearchService
 from database import DatabaseManager
+from sqlalchemy_db import DatabaseManager as SqlDatabaseManager, pack_amenities, unpack_amenities
 
 class TestHotelService:
     def setup_method(self):
@@ -82,6 +83,15 @@ class TestHotelService:
         assert rooms[0].room_number == "101"
         assert rooms[0].room_type == RoomType.SINGLE
 
+    def test_get_hotels_pagination(self):
+        """Test hotels are paginated in insertion order"""
+        extra = [self.hotel_service.create_hotel(Hotel(name=f"Hotel {i}", city="Pune")) for i in range(3)]
+
+        page = self.hotel_service.get_hotels(skip=1, limit=2)
+
+        assert [h.id for h in page] == [extra[0].id, extra[1].id]
+        assert self.hotel_service.get_hotels(skip=10) == []
+
 class TestSearchService:
     def setup_method(self):
         """Setup test data"""
@@ -140,6 +150,13 @@ class TestSearchService:
         assert len(results) == 1
         assert results[0].name == "Mumbai Grand Hotel"
     
+    def test_search_multiple_name_words_match_all(self):
+        """Every word of a multi-word name query must match"""
+        results = self.search_service.search_hotels(hotel_name="Mumbai Hotel")
+        
+        assert len(results) == 1
+        assert results[0].name == "Mumbai Grand Hotel"
+    
     def test_search_case_insensitive(self):
         """Test case-insensitive search"""
         results = self.search_service.search_hotels(city="mumbai")
@@ -153,6 +170,54 @@ class TestSearchService:
         results = self.search_service.search_hotels(city="Mumbai", limit=1)
         assert len(results) == 1
 
+    def test_created_hotel_is_searchable_without_rebuild(self):
+        """Hotels created through HotelService are indexed incrementally"""
+        hotel_service = HotelService(search_service=self.search_service)
+        assert len(self.search_service.search_hotels(city="Mumbai")) == 2
+
+        hotel = hotel_service.create_hotel(Hotel(name="Seabreeze Suites", city="Mumbai"))
+
+        assert len(self.search_service.search_hotels(city="Mumbai")) == 3
+        assert self.search_service.search_hotels(hotel_name="breeze") == [hotel]
+
+        self.search_service.remove_hotel_from_index(hotel)
+        assert self.search_service.search_hotels(hotel_name="breeze") == []
+
+    def test_search_infix_match_can_be_disabled(self):
+        """With suffix matching off, name words only match by prefix"""
+        assert len(self.search_service.search_hotels(hotel_name="yal")) == 1
+
+        prefix_only = SearchService(suffix_match=False)
+        assert prefix_only.search_hotels(hotel_name="yal") == []
+        assert len(prefix_only.search_hotels(hotel_name="roy")) == 1
+
+    def test_readded_hotel_id_replaces_previous_index_entries(self):
+        """Creating a hotel under an existing id drops the old city and name from the index"""
+        hotel_service = HotelService(search_service=self.search_service)
+        hotel_service.create_hotel(Hotel(id="h1", name="Seaside Inn", city="Goa"))
+        assert len(self.search_service.search_hotels(city="Goa")) == 1
+        
+        lodge = hotel_service.create_hotel(Hotel(id="h1", name="Mountain Lodge", city="Delhi"))
+        
+        assert self.search_service.search_hotels(city="Goa") == []
+        assert self.search_service.search_hotels(hotel_name="seaside") == []
+        assert lodge in self.search_service.search_hotels(city="Delhi")
+        assert self.search_service.search_hotels(hotel_name="lodge") == [lodge]
+    
+    def test_copied_and_reassigned_hotels_index_under_new_fields(self):
+        """Derived search keys follow model_copy updates and field assignment"""
+        moved = self.royal_hotel.model_copy(update={"id": "moved-hotel", "city": "Goa", "name": "Seaside Resort"})
+        renamed = Hotel(name="Lake Inn", city="Pune")
+        renamed.city = "Jaipur"
+        for hotel in (moved, renamed):
+            self.search_service.add_hotel_to_index(hotel)
+        
+        assert self.search_service.search_hotels(city="Goa") == [moved]
+        assert self.search_service.search_hotels(hotel_name="seaside") == [moved]
+        assert self.search_service.search_hotels(city="Jaipur") == [renamed]
+        assert self.search_service.search_hotels(city="Pune") == []
+        assert self.royal_hotel._city_lc == "mumbai"
+
 class TestBookingService:
     def setup_method(self):
         """Setup test data"""
@@ -329,6 +394,143 @@ class TestBookingService:
         cancelled_booking = self.db.bookings[booking.id]
         assert cancelled_booking.status == "cancelled"
 
+    def test_cancelled_booking_frees_room(self):
+        """A cancelled booking should no longer block its dates"""
+        booking_request = BookingRequest(
+            room_id=self.test_room.id,
+            guest_name="First Guest",
+            guest_email="first@example.com",
+            check_in_date=date.today() + timedelta(days=20),
+            check_out_date=date.today() + timedelta(days=22)
+        )
+        booking = self.booking_service.create_booking(booking_request)
+        self.booking_service.cancel_booking(booking.id)
+        
+        rebooking = self.booking_service.create_booking(BookingRequest(
+            room_id=self.test_room.id,
+            guest_name="Second Guest",
+            guest_email="second@example.com",
+            check_in_date=date.today() + timedelta(days=21),
+            check_out_date=date.today() + timedelta(days=23)
+        ))
+        assert rebooking.status == "confirmed"
+    
+    def test_overlap_detected_across_service_instances(self):
+        """A second BookingService over the same store must see the first one's bookings"""
+        request = BookingRequest(
+            room_id=self.test_room.id,
+            guest_name="First Guest",
+            guest_email="first@example.com",
+            check_in_date=date.today() + timedelta(days=40),
+            check_out_date=date.today() + timedelta(days=42)
+        )
+        self.booking_service.create_booking(request)
+        
+        other_service = BookingService()
+        with pytest.raises(ValueError, match="not available"):
+            other_service.create_booking(request.model_copy(update={"guest_email": "second@example.com"}))
+        assert other_service.check_availability(self.test_room.id, [(request.check_in_date, request.check_out_date)]) == [False]
+        assert len(self.db.bookings) == 1
+    
+    def test_overlap_with_earlier_of_several_bookings(self):
+        """Overlap must be found even when later bookings exist for the room"""
+        for i, offset in enumerate([30, 40, 50]):
+            self.booking_service.create_booking(BookingRequest(
+                room_id=self.test_room.id,
+                guest_name=f"Series Guest {i}",
+                guest_email=f"series{i}@example.com",
+                check_in_date=date.today() + timedelta(days=offset),
+                check_out_date=date.today() + timedelta(days=offset + 3)
+            ))
+        
+        with pytest.raises(ValueError, match="Room is not available"):
+            self.booking_service.create_booking(BookingRequest(
+                room_id=self.test_room.id,
+                guest_name="Late Guest",
+                guest_email="late@example.com",
+                check_in_date=date.today() + timedelta(days=32),
+                check_out_date=date.today() + timedelta(days=35)
+            ))
+
+    def test_rate_limit_per_guest_email(self):
+        """Booking attempts beyond the per-email limit should be rejected"""
+        for i in range(self.booking_service._rate_limit_max):
+            self.booking_service.create_booking(BookingRequest(
+                room_id=self.test_room.id,
+                guest_name="Frequent Guest",
+                guest_email="frequent@example.com",
+                check_in_date=date.today() + timedelta(days=60 + 2 * i),
+                check_out_date=date.today() + timedelta(days=61 + 2 * i)
+            ))
+        
+        with pytest.raises(ValueError, match="Rate limit exceeded"):
+            self.booking_service.create_booking(BookingRequest(
+                room_id=self.test_room.id,
+                guest_name="Frequent Guest",
+                guest_email="frequent@example.com",
+                check_in_date=date.today() + timedelta(days=90),
+                check_out_date=date.today() + timedelta(days=91)
+            ))
+
+    def test_get_bookings_filtered_and_paginated(self):
+        """Bookings are listed newest first and paginated after filtering"""
+        created = []
+        for i, name in enumerate(["Page Guest", "Other Guest", "page guest", "Page Guest"]):
+            created.append(self.booking_service.create_booking(BookingRequest(
+                room_id=self.test_room.id,
+                guest_name=name,
+                guest_email=f"page{i}@example.com",
+                check_in_date=date.today() + timedelta(days=100 + 2 * i),
+                check_out_date=date.today() + timedelta(days=101 + 2 * i)
+            )))
+            time.sleep(0.001)
+
+        page = self.booking_service.get_bookings(guest_name="PAGE", skip=1, limit=1)
+        assert page == [created[2]]
+        assert self.booking_service.get_bookings(guest_name="page", skip=1) == [created[2], created[0]]
+
+    def test_check_availability_for_many_ranges(self):
+        """Bulk availability matches the single-booking overlap rules"""
+        day = lambda n: date.today() + timedelta(days=n)
+        self.booking_service.create_booking(BookingRequest(
+            room_id=self.test_room.id,
+            guest_name="Bulk Guest",
+            guest_email="bulk@example.com",
+            check_in_date=day(10),
+            check_out_date=day(13)
+        ))
+
+        ranges = [(day(7), day(10)), (day(9), day(11)), (day(12), day(15)), (day(13), day(14))]
+        assert self.booking_service.check_availability(self.test_room.id, ranges) == [True, False, False, True]
+    
+    def test_check_availability_rejects_unknown_room_and_reversed_ranges(self):
+        """Bulk availability validates like create_booking and never locks unknown rooms"""
+        day = lambda n: date.today() + timedelta(days=n)
+        
+        with pytest.raises(ValueError, match="Room not found"):
+            self.booking_service.check_availability("nonexistent-room", [(day(1), day(2))])
+        assert "nonexistent-room" not in self.booking_service._room_locks
+        with pytest.raises(ValueError, match="Check-out date"):
+            self.booking_service.check_availability(self.test_room.id, [(day(1), day(2)), (day(5), day(3))])
+        assert self.booking_service.check_availability(self.test_room.id, []) == []
+
+    def test_booking_copy_refreshes_date_keys(self):
+        """A copied booking with new dates overlaps by its own dates, not the original's"""
+        day = lambda n: date.today() + timedelta(days=n)
+        booking = self.booking_service.create_booking(BookingRequest(
+            room_id=self.test_room.id,
+            guest_name="Copy Guest",
+            guest_email="copy@example.com",
+            check_in_date=day(20),
+            check_out_date=day(22)
+        ))
+        moved = booking.model_copy(update={"check_in_date": day(30), "check_out_date": day(32)})
+        
+        assert (moved._check_in_ord, moved._check_out_ord) == (day(30).toordinal(), day(32).toordinal())
+        moved.guest_name = "New Guest"
+        assert moved._guest_name_lc == "new guest"
+        assert booking._guest_name_lc == "copy guest"
+
     def test_booking_same_day_allowed_and_charged_min_one_night(self):
         """Same-day check-in/out should be allowed and charged as 1 night"""
         booking_request = BookingRequest(
@@ -342,6 +544,109 @@ class TestBookingService:
         assert booking is not None
         assert booking.total_price == self.test_room.price  # 1 night minimum
 
+class TestSqlAlchemyDatabaseManager:
+    def setup_method(self):
+        """Setup a private in-memory SQL store"""
+        self.db = SqlDatabaseManager("sqlite://")
+    
+    @pytest.mark.parametrize("db_url", ["sqlite://", "sqlite:///:memory:",
+                                        "sqlite:///file:hotels?mode=memory&uri=true"])
+    def test_in_memory_urls_share_one_database_across_threads(self, db_url):
+        """In-memory URLs skip file-database pool sizing and every thread sees the same data"""
+        db = SqlDatabaseManager(db_url)
+        db.add_hotel({"name": "Pool Hotel", "city": "Goa"}, [])
+        assert db.get_city_stats() == {"Goa": 1}
+        
+        # A connection opened for another thread would be a separate, empty database
+        stats = []
+        reader = threading.Thread(target=lambda: stats.append(db.get_city_stats()))
+        reader.start()
+        reader.join()
+        assert stats == [{"Goa": 1}]
+    
+    def test_streaming_survives_interleaved_calls(self):
+        """Other manager calls made mid-stream must not close the streaming session"""
+        for i in range(5):
+            self.db.add_hotel({"name": f"Stream Hotel {i}", "city": "Pune"}, [])
+        
+        names = []
+        for hotel in self.db.iter_hotels(chunk_size=2):
+            names.append(hotel.name)
+            assert self.db.get_city_stats() == {"Pune": 5}
+        
+        assert names == [f"Stream Hotel {i}" for i in range(5)]
+    
+    def test_amenity_bitmask_round_trip(self):
+        """Amenities pack into one bit each and unpack in registry order"""
+        mask = pack_amenities(["Spa", "WiFi", "Spa"])
+        
+        assert mask == pack_amenities(["WiFi"]) | pack_amenities(["Spa"])
+        assert unpack_amenities(mask) == ["WiFi", "Spa"]
+        assert unpack_amenities(0) == []
+        with pytest.raises(ValueError, match="Unknown amenity: TV"):
+            pack_amenities(["WiFi", "TV"])
+    
+    def test_rooms_filtered_by_required_amenities(self):
+        """Only rooms having every requested amenity are returned"""
+        hotel_id = self.db.add_hotel({"name": "Amenity Hotel", "city": "Goa", "amenities": ["Pool"]}, [
+            {"room_number": "101", "room_type": "Single", "price": 3000, "amenities": ["AC", "Safe"]},
+            {"room_number": "102", "room_type": "Double", "price": 4000, "amenities": ["AC", "Sea View", "Safe"]},
+            {"room_number": "103", "room_type": "Suite", "price": 9000, "amenities": ["Sea View"]},
+        ])
+        
+        rooms = self.db.get_rooms_by_hotel(hotel_id, amenities=["AC", "Sea View"])
+        
+        assert [room.room_number for room in rooms] == ["102"]
+        assert rooms[0].amenity_names == ["AC", "Sea View", "Safe"]
+        assert len(self.db.get_rooms_by_hotel(hotel_id)) == 3
+        with pytest.raises(ValueError):
+            self.db.add_hotel({"name": "Bad Hotel", "city": "Goa"},
+                              [{"room_number": "101", "room_type": "Single", "price": 3000, "amenities": ["TV"]}])
+    
+    def _add_search_hotels(self):
+        self.db.add_hotel({"name": "Grand Palace", "city": "Mumbai", "description": "Sea facing rooms"}, [])
+        self.db.add_hotel({"name": "Royal Inn", "city": "Delhi", "description": "Near the palace gardens"}, [])
+        self.db.add_hotel({"name": 'The "Star" Resort', "city": "Goa", "description": "Beach 100% cover"}, [])
+    
+    @pytest.mark.parametrize("has_fts", [True, False])
+    def test_search_matches_word_prefixes_across_fields(self, has_fts):
+        """FTS and the LIKE fallback both prefix-match every word over name, city and description"""
+        self.db.has_fts = has_fts
+        self._add_search_hotels()
+        
+        def names(query):
+            return sorted(hotel.name for hotel in self.db.search_hotels(query))
+        
+        assert names("pal") == ["Grand Palace", "Royal Inn"]
+        assert names("mum sea") == ["Grand Palace"]
+        assert names("delhi garden") == ["Royal Inn"]
+        assert names("alace") == []
+        assert names("grand delhi") == []
+        assert names("   ") == []
+    
+    @pytest.mark.parametrize("has_fts", [True, False])
+    def test_search_treats_query_syntax_as_literal_text(self, has_fts):
+        """Quotes, FTS operators and LIKE wildcards in the query are not interpreted"""
+        self.db.has_fts = has_fts
+        self._add_search_hotels()
+        
+        assert [hotel.name for hotel in self.db.search_hotels('"star"')] == ['The "Star" Resort']
+        assert [hotel.name for hotel in self.db.search_hotels("NEAR palace")] == ["Royal Inn"]
+        assert self.db.search_hotels("OR palace") == []
+        assert self.db.search_hotels("*") == []
+        assert self.db.search_hotels("%") == []
+        assert self.db.search_hotels("_") == []
+    
+    def test_fts_index_follows_inserts(self):
+        """Triggers keep hotels_fts in sync with rows added after the index exists"""
+        assert self.db.has_fts
+        self._add_search_hotels()
+        assert self.db.search_hotels("lakeview") == []
+        
+        self.db.add_hotel({"name": "Lakeview Suites", "city": "Pune"}, [])
+        
+        assert [hotel.name for hotel in self.db.search_hotels("lakeview pune")] == ["Lakeview Suites"]
+
 def test_assignment3_simultaneous_booking_overlap():
     """Assignment 3: Simultaneous Booking - overlapping dates should fail for second booking"""
     booking_service = BookingService()